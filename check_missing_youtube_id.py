@@ -7,9 +7,9 @@ from __future__ import annotations
 
 import csv
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, Set, Tuple
-from urllib.parse import parse_qs, urlparse
 
 try:
     from yt_dlp import YoutubeDL
@@ -18,12 +18,24 @@ except ImportError as exc:  # pragma: no cover - dependency check
         "yt-dlp is required. Install it with: pip install yt-dlp"
     ) from exc
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to the stdlib csv module
+    pacsv = None
+
 CHANNELS = {
     "thoibao-de": "https://www.youtube.com/@thoibao-de",
     "ThoibaoNews": "https://www.youtube.com/@ThoibaoNews",
     "ThoibaoEU": "https://www.youtube.com/@ThoibaoEU",
 }
 
+VIDEO_ID_RE = re.compile(
+    r"(?:youtu\.be/|youtube\.com/(?:embed/|shorts/|v/|live/|watch\?(?:[^&]*&)*v=))"
+    r"([A-Za-z0-9_-]{11})"
+)
+BARE_VIDEO_ID_RE = re.compile(r"([A-Za-z0-9_-]{11})")
+
 THIS_DIR = Path(__file__).resolve().parent
 ARTICLE_VIDEOS_CSV = THIS_DIR.parent / "thoibao" / "article_videos.csv"
 CHANNEL_IDS_TXT = THIS_DIR / "channel_video_ids.txt"
@@ -52,35 +64,41 @@ def fetch_channel_video_ids(channel_url: str) -> Set[str]:
 
 def extract_video_id(url: str) -> str | None:
     """Extract a YouTube video id from common URL formats."""
-    parsed = urlparse(url)
-    host = parsed.netloc.lower()
-    path = parsed.path
-
-    if "youtube.com" in host:
-        if path.startswith("/embed/"):
-            return path.split("/")[2].split("?")[0]
-        if path.startswith("/shorts/"):
-            return path.split("/")[2].split("?")[0]
-        if path == "/watch":
-            return parse_qs(parsed.query).get("v", [None])[0]
-    if "youtu.be" in host:
-        slug = path.lstrip("/").split("/")[0]
-        if slug:
-            return slug
-
-    match = re.search(r"([A-Za-z0-9_-]{11})", url)
+    match = VIDEO_ID_RE.search(url) or BARE_VIDEO_ID_RE.search(url)
     return match.group(1) if match else None
 
 
-def load_article_video_ids(csv_path: Path) -> Set[str]:
-    ids: Set[str] = set()
+def iter_video_paths(csv_path: Path) -> Iterable[str]:
+    """Yield the video_path column, using pyarrow's C parser when available."""
+    if pacsv is not None:
+        try:
+            table = pacsv.read_csv(
+                csv_path,
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=["video_path"],
+                    # Force strings to match what csv.DictReader yields.
+                    column_types={"video_path": pa.string()},
+                ),
+            )
+        except Exception:
+            table = None  # e.g. missing column; use the stdlib reader
+        if table is not None:
+            for value in table.column("video_path").to_pylist():
+                yield "" if value is None else str(value)
+            return
+
     with csv_path.open(newline="", encoding="utf-8") as handle:
         reader = csv.DictReader(handle)
         for row in reader:
-            url = row.get("video_path") or ""
-            vid = extract_video_id(url)
-            if vid:
-                ids.add(vid)
+            yield row.get("video_path") or ""
+
+
+def load_article_video_ids(csv_path: Path) -> Set[str]:
+    ids: Set[str] = set()
+    for url in iter_video_paths(csv_path):
+        vid = extract_video_id(url)
+        if vid:
+            ids.add(vid)
     return ids
 
 
@@ -98,10 +116,11 @@ def compare_sets(channel_ids: Set[str], article_ids: Set[str]) -> Tuple[Set[str]
 def main() -> None:
     print("Collecting video IDs from channels...")
     all_channel_ids: Set[str] = set()
-    for name, url in CHANNELS.items():
-        ids = fetch_channel_video_ids(url)
-        all_channel_ids.update(ids)
-        print(f"- {name}: {len(ids)} videos")
+    # Each fetch blocks on yt-dlp network I/O, so run the channels concurrently.
+    with ThreadPoolExecutor(max_workers=len(CHANNELS)) as executor:
+        for name, ids in zip(CHANNELS, executor.map(fetch_channel_video_ids, CHANNELS.values())):
+            all_channel_ids.update(ids)
+            print(f"- {name}: {len(ids)} videos")
 
     write_ids(all_channel_ids, CHANNEL_IDS_TXT)
     print(f"Wrote {len(all_channel_ids)} unique IDs to {CHANNEL_IDS_TXT}")
@@ -6,8 +6,12 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
+import random
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List, Sequence
@@ -24,21 +28,43 @@ except Exception as exc:  # pragma: no cover - import guard
         "Install with: pip install youtube-comment-downloader",
     ) from exc
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to the stdlib csv module
+    pacsv = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_ARTICLE_VIDEOS = BASE_DIR / "thoibao" / "article_videos.csv"
 DEFAULT_ARTICLES = BASE_DIR / "thoibao" / "articles.csv"
 DEFAULT_OUTPUT_DIR = BASE_DIR / "youtube_comments"
 DEFAULT_SORT = "recent"
 DEFAULT_SLEEP = 0.1
+DEFAULT_WORKERS = 4
+WRITE_BUFFER_BYTES = 1 << 20
 
 YOUTUBE_ID_RE = re.compile(
     r"(?:youtu\.be/|youtube\.com/(?:watch\?v=|embed/|shorts/|v/|live/))"
     r"([A-Za-z0-9_-]{6,})",
     re.IGNORECASE,
 )
+# One scan per row: either a YouTube URL anywhere in the value (group 1) or
+# the whole value being a bare video id (group 2).
+NORMALIZE_ID_RE = re.compile(
+    r"(?:youtu\.be/|youtube\.com/(?:watch\?(?:[^&]*&)*v=|embed/|shorts/|v/|live/))"
+    r"([A-Za-z0-9_-]{6,})"
+    r"|^([A-Za-z0-9_-]{6,})$",
+    re.IGNORECASE,
+)
+SANITIZE_RE = re.compile(r"[^A-Za-z0-9_.-]")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommentJob:
     article_id: str
     article_title: str | None
@@ -75,20 +101,25 @@ def normalize_youtube_url(raw: str) -> str | None:
     candidate = (raw or "").strip()
     if not candidate:
         return None
-    if candidate.startswith("//"):
-        candidate = "https:" + candidate
-    video_id = extract_youtube_id(candidate)
-    if video_id:
+    match = NORMALIZE_ID_RE.search(candidate)
+    if match:
+        video_id = match.group(1) or match.group(2)
         return f"https://www.youtube.com/watch?v={video_id}"
     if candidate.lower().startswith("http"):
         return candidate
-    if re.fullmatch(r"[A-Za-z0-9_-]{6,}", candidate):
-        return f"https://www.youtube.com/watch?v={candidate}"
     return None
 
 
+if orjson is not None:
+    def encode_comment(comment: dict) -> bytes:
+        return orjson.dumps(comment, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    def encode_comment(comment: dict) -> bytes:
+        return json.dumps(comment, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
 def sanitize_component(value: str) -> str:
-    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", value)
+    safe = SANITIZE_RE.sub("_", value)
     safe = safe.strip("._")
     return safe or "video"
 
@@ -109,56 +140,116 @@ def read_article_titles(articles_path: Path) -> dict[str, str]:
     return titles
 
 
+def iter_video_rows(csv_path: Path) -> Iterable[tuple[str, str, object]]:
+    """Yield (article_id, video_path, sequence_number) rows from the CSV.
+
+    Uses pyarrow's vectorized C parser when available; otherwise falls back
+    to csv.DictReader. String columns are normalized to '' for missing values.
+    """
+    if pacsv is not None:
+        try:
+            table = pacsv.read_csv(
+                csv_path,
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=["article_id", "video_path", "sequence_number"],
+                    # Force strings so numeric-looking ids keep leading zeros
+                    # and match what csv.DictReader yields.
+                    column_types={
+                        "article_id": pa.string(),
+                        "video_path": pa.string(),
+                        "sequence_number": pa.string(),
+                    },
+                ),
+            )
+        except Exception:
+            table = None  # e.g. missing columns; use the stdlib reader
+        if table is not None:
+            yield from zip(
+                ("" if value is None else str(value) for value in table.column("article_id").to_pylist()),
+                ("" if value is None else str(value) for value in table.column("video_path").to_pylist()),
+                table.column("sequence_number").to_pylist(),
+            )
+            return
+
+    configure_csv_field_limit()
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield (
+                row.get("article_id") or "",
+                row.get("video_path") or "",
+                row.get("sequence_number", 1),
+            )
+
+
 def read_jobs(
     csv_path: Path,
     limit: int | None,
     article_titles: dict[str, str],
-) -> List[CommentJob]:
-    configure_csv_field_limit()
+    output_dir: Path,
+    overwrite: bool = False,
+) -> tuple[List[CommentJob], int]:
+    """Read jobs from the CSV, skipping rows whose output file already exists.
+
+    Returns the jobs together with the number of rows skipped. Existing
+    outputs are detected with a single directory listing instead of one
+    stat() per job.
+    """
+    existing_names: set[str] = set()
+    if not overwrite and output_dir.is_dir():
+        # os.scandir gives the names straight from the readdir buffer without
+        # allocating a Path object per entry.
+        with os.scandir(output_dir) as entries:
+            existing_names = {entry.name for entry in entries}
 
     jobs: List[CommentJob] = []
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            article_id = (row.get("article_id") or "").strip()
-            raw_video = (row.get("video_path") or "").strip()
-            if not article_id or not raw_video:
-                continue
-
-            url = normalize_youtube_url(raw_video)
-            if not url:
-                print(
-                    f"[warn] Bỏ qua URL không hợp lệ cho article_id={article_id}: {raw_video}",
-                    file=sys.stderr,
-                )
-                continue
+    skipped = 0
+    for article_id, raw_video, sequence_raw in iter_video_rows(csv_path):
+        article_id = article_id.strip()
+        raw_video = raw_video.strip()
+        if not article_id or not raw_video:
+            continue
 
-            video_id = extract_youtube_id(url)
-            if not video_id:
-                print(
-                    f"[warn] Không lấy được video_id cho article_id={article_id}: {url}",
-                    file=sys.stderr,
-                )
-                continue
+        url = normalize_youtube_url(raw_video)
+        if not url:
+            print(
+                f"[warn] Bỏ qua URL không hợp lệ cho article_id={article_id}: {raw_video}",
+                file=sys.stderr,
+            )
+            continue
 
-            try:
-                sequence = int(row.get("sequence_number", 1))
-            except (TypeError, ValueError):
-                sequence = 1
-
-            jobs.append(
-                CommentJob(
-                    article_id=article_id,
-                    article_title=article_titles.get(article_id),
-                    sequence=sequence,
-                    video_id=video_id,
-                    url=url,
-                ),
+        video_id = extract_youtube_id(url)
+        if not video_id:
+            print(
+                f"[warn] Không lấy được video_id cho article_id={article_id}: {url}",
+                file=sys.stderr,
             )
-            if limit and len(jobs) >= limit:
-                break
+            continue
+
+        try:
+            sequence = int(sequence_raw)
+        except (TypeError, ValueError):
+            sequence = 1
+
+        name = f"{sanitize_component(article_id)}_{sequence:02d}_{video_id}.jsonl"
+        if name in existing_names:
+            skipped += 1
+            print(f"[skip] {output_dir / name} đã tồn tại")
+            continue
+
+        jobs.append(
+            CommentJob(
+                article_id=article_id,
+                article_title=article_titles.get(article_id),
+                sequence=sequence,
+                video_id=video_id,
+                url=url,
+            ),
+        )
+        if limit and len(jobs) >= limit:
+            break
 
-    return jobs
+    return jobs, skipped
 
 
 def build_output_path(job: CommentJob, output_dir: Path) -> Path:
@@ -203,15 +294,24 @@ def write_comments(
 
     written = 0
     try:
-        with output_path.open("w", encoding="utf-8") as handle:
+        # Accumulate encoded lines (newline included by encode_comment) in a
+        # bytearray and flush it in ~1 MiB chunks; the buffer amortizes the
+        # write-call overhead on large videos.
+        buffer = bytearray()
+        append = buffer.extend
+        with output_path.open("wb") as handle:
             for comment in comments:
                 if static_title:
                     comment["video_title"] = static_title
-                json.dump(comment, handle, ensure_ascii=False)
-                handle.write("\n")
+                append(encode_comment(comment))
                 written += 1
+                if len(buffer) >= WRITE_BUFFER_BYTES:
+                    handle.write(buffer)
+                    buffer.clear()
                 if max_comments and written >= max_comments:
                     break
+            if buffer:
+                handle.write(buffer)
     except Exception as exc:
         print(
             f"[error] Lỗi khi ghi comment cho {job.url}: {exc}",
@@ -273,6 +373,12 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=DEFAULT_SLEEP,
         help="Thời gian sleep giữa các request (default: %(default)s).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Số video tải song song (default: %(default)s).",
+    )
     parser.add_argument(
         "--overwrite",
         action="store_true",
@@ -289,44 +395,63 @@ def main(argv: Sequence[str] | None = None) -> int:
         return 1
 
     article_titles = read_article_titles(args.articles)
-    jobs = read_jobs(args.article_videos, args.limit, article_titles)
-    if not jobs:
+    jobs, skipped = read_jobs(
+        args.article_videos,
+        args.limit,
+        article_titles,
+        output_dir=args.output_dir,
+        overwrite=args.overwrite,
+    )
+    if not jobs and not skipped:
         print("Không tìm thấy job hợp lệ trong article_videos.csv", file=sys.stderr)
         return 1
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
     sort_by = choose_sort(args.sort_by)
-    downloader = YoutubeCommentDownloader()
 
     downloaded = 0
-    skipped = 0
     failed = 0
 
-    for job in jobs:
-        output_path = build_output_path(job, args.output_dir)
-        if output_path.exists() and not args.overwrite:
-            skipped += 1
-            print(f"[skip] {output_path} đã tồn tại")
-            continue
+    pending = [(job, build_output_path(job, args.output_dir)) for job in jobs]
 
-        written = write_comments(
+    # Each write_comments call blocks on HTTPS round-trips to YouTube, so run
+    # jobs concurrently. requests.Session is not thread-safe, so every worker
+    # thread gets its own YoutubeCommentDownloader.
+    worker_state = threading.local()
+
+    def run_job(job: CommentJob, output_path: Path) -> int | None:
+        downloader = getattr(worker_state, "downloader", None)
+        if downloader is None:
+            downloader = worker_state.downloader = YoutubeCommentDownloader()
+        return write_comments(
             downloader=downloader,
             job=job,
             output_path=output_path,
             sort_by=sort_by,
             language=args.language,
-            sleep=args.sleep,
+            # Jitter the polling interval so workers don't hit YouTube in lockstep.
+            sleep=args.sleep + random.uniform(0, args.sleep),
             max_comments=args.max_comments,
             static_title=job.article_title,
         )
-        if written is None:
-            failed += 1
-            continue
 
-        downloaded += 1
-        print(
-            f"[ok] {job.url} -> {output_path} ({written} comments)",
-        )
+    workers = max(1, args.workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_job, job, output_path): (job, output_path)
+            for job, output_path in pending
+        }
+        for future in as_completed(futures):
+            job, output_path = futures[future]
+            written = future.result()
+            if written is None:
+                failed += 1
+                continue
+
+            downloaded += 1
+            print(
+                f"[ok] {job.url} -> {output_path} ({written} comments)",
+            )
 
     print(
         f"Done. downloaded={downloaded}, skipped_existing={skipped}, failed={failed}",
@@ -1,4 +1,4 @@
-from downloader import search_dict
+from downloader import search_dict, search_dict_first, search_dict_multi
 
 
 def test_that_nothing_is_yielded_from_empty_dict():
@@ -29,6 +29,36 @@ def test_that_expected_value_is_yielded_when_nesting_dictionaries():
     )
 
 
+def test_that_first_returns_first_match():
+    assert search_dict_first({"a": {"test": "expected"}}, "test") == "expected"
+
+
+def test_that_first_returns_default_when_key_is_absent():
+    assert search_dict_first({"a": {"b": 1}}, "test") is None
+    assert search_dict_first({}, "test", default="fallback") == "fallback"
+
+
+def test_that_multi_matches_separate_search_dict_passes():
+    payload = {"a": [{"x": 1}, {"y": 2, "b": {"x": 3}}], "y": 4}
+    hits = search_dict_multi(payload, ("x", "y", "z"))
+    for key in ("x", "y", "z"):
+        assert hits[key] == list(search_dict(payload, key))
+
+
+def test_that_multi_descends_into_matched_values():
+    # search_dict stops at a matched value, but search_dict_multi keeps
+    # traversing it, so a key nested inside its own match is also found
+    # (this is why the commentViewModel call site filters wrapper dicts).
+    payload = {"commentViewModel": {"commentViewModel": {"commentId": "c1"}}}
+    assert list(search_dict(payload, "commentViewModel")) == [
+        {"commentViewModel": {"commentId": "c1"}}
+    ]
+    assert search_dict_multi(payload, ("commentViewModel",))["commentViewModel"] == [
+        {"commentViewModel": {"commentId": "c1"}},
+        {"commentId": "c1"},
+    ]
+
+
 def test_benchmark_search(benchmark):
     test_dict = {index: list(range(10)) for index in range(1, 30)}
     benchmark(lambda: list(search_dict(test_dict, "test")))
@@ -6,6 +6,18 @@ import time
 
 import dateparser
 import requests
+from urllib3.util import Retry
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; fall back to regex scans
+    HTMLParser = None
 
 YOUTUBE_VIDEO_URL = 'https://www.youtube.com/watch?v={youtube_id}'
 YOUTUBE_CONSENT_URL = 'https://consent.youtube.com/save'
@@ -19,30 +31,155 @@ YT_CFG_RE = r'ytcfg\.set\s*\(\s*({.+?})\s*\)\s*;'
 YT_INITIAL_DATA_RE = r'(?:window\s*\[\s*["\']ytInitialData["\']\s*\]|ytInitialData)\s*=\s*({.+?})\s*;\s*(?:var\s+meta|</script|\n)'
 YT_HIDDEN_INPUT_RE = r'<input\s+type="hidden"\s+name="([A-Za-z0-9_]+)"\s+value="([A-Za-z0-9_\-\.]*)"\s*(?:required|)\s*>'
 
+RELATIVE_TIME_RE = re.compile(r'(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago')
+RELATIVE_TIME_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400,
+                       'week': 604800, 'month': 2628000, 'year': 31536000}
+
+YT_WATCH_TITLE_RE = re.compile(
+    r'<yt-formatted-string[^>]+class="[^"]*ytd-watch-metadata[^"]*"[^>]+title="([^"]+)"',
+    re.IGNORECASE,
+)
+YT_META_TITLE_RE = re.compile(r'<meta[^>]+name="title"[^>]+content="([^"]+)"')
+YT_TITLE_TAG_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def search_dict(partial, search_key, _dict=dict, _list=list):
+    """Yield every value stored under search_key anywhere in a nested JSON tree."""
+    stack = [partial]
+    push = stack.append
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        current_item = pop()
+        item_type = type(current_item)
+        if item_type is _dict:
+            for key, value in current_item.items():
+                if key == search_key:
+                    yield value
+                else:
+                    push(value)
+        elif item_type is _list:
+            extend(current_item)
+
+
+def parse_relative_time(text, now=None):
+    """Parse YouTube's relative timestamps ("3 days ago") into a Unix timestamp.
+
+    Returns None when the text doesn't match, so callers can fall back to
+    dateparser, which is orders of magnitude slower per call.
+    """
+    match = RELATIVE_TIME_RE.match(text)
+    if not match:
+        return None
+    if now is None:
+        now = time.time()
+    return now - int(match.group(1)) * RELATIVE_TIME_UNITS[match.group(2)]
+
+
+def search_dict_first(partial, search_key, default=None, _dict=dict, _list=list):
+    """Return the first value stored under search_key, or default if absent.
+
+    Unlike next(search_dict(...), default) this returns directly from the
+    traversal loop, with no generator frame to create, resume and close.
+    """
+    stack = [partial]
+    push = stack.append
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        current_item = pop()
+        item_type = type(current_item)
+        if item_type is _dict:
+            for key, value in current_item.items():
+                if key == search_key:
+                    return value
+                push(value)
+        elif item_type is _list:
+            extend(current_item)
+    return default
+
+
+def search_dict_multi(partial, search_keys, _dict=dict, _list=list):
+    """Collect the values for several keys in a single DFS over a nested JSON tree.
+
+    Returns a dict mapping each key in search_keys to the list of values found,
+    in the same order a separate search_dict pass would yield them. Matched
+    values are still traversed, so keys nested inside other matches are found.
+    """
+    hits = {key: [] for key in search_keys}
+    stack = [partial]
+    push = stack.append
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        current_item = pop()
+        item_type = type(current_item)
+        if item_type is _dict:
+            for key, value in current_item.items():
+                if key in hits:
+                    hits[key].append(value)
+                push(value)
+        elif item_type is _list:
+            extend(current_item)
+    return hits
+
+
+# Continuation targets that carry comments/replies, checked once per action.
+COMMENT_SECTION_TARGETS = frozenset({
+    'comments-section',
+    'engagement-panel-comments-section',
+    'shorts-engagement-panel-comments-section',
+})
+COMMENT_REPLIES_PREFIX = 'comment-replies-item'
+
+# Keys extracted from every continuation response in get_comments_from_url.
+COMMENT_RESPONSE_KEYS = (
+    'externalErrorMessage',
+    'reloadContinuationItemsCommand',
+    'appendContinuationItemsAction',
+    'commentSurfaceEntityPayload',
+    'commentViewModel',
+    'engagementToolbarStateEntityPayload',
+    'commentEntityPayload',
+)
+
 
 class YoutubeCommentDownloader:
 
     def __init__(self):
         self.session = requests.Session()
+        # All traffic goes to a handful of youtube.com hosts; size the keep-alive
+        # pool explicitly so every continuation request reuses the same TLS
+        # connections instead of falling back to the default adapter settings.
+        # Transient failures are retried by urllib3 with exponential backoff
+        # (honouring Retry-After) rather than a hand-rolled sleep loop.
+        retry = Retry(total=5, backoff_factor=1.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET', 'POST'])
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=10,
+                                                max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers['User-Agent'] = USER_AGENT
         self.session.cookies.set('CONSENT', 'YES+cb', domain='.youtube.com')
+        self._cached_ytcfg = None
 
-    def ajax_request(self, endpoint, ytcfg, retries=5, sleep=20, timeout=60):
+    def ajax_request(self, endpoint, ytcfg, timeout=60):
         url = 'https://www.youtube.com' + endpoint['commandMetadata']['webCommandMetadata']['apiUrl']
 
         data = {'context': ytcfg['INNERTUBE_CONTEXT'],
                 'continuation': endpoint['continuationCommand']['token']}
 
-        for _ in range(retries):
-            try:
-                response = self.session.post(url, params={'key': ytcfg['INNERTUBE_API_KEY']}, json=data, timeout=timeout)
-                if response.status_code == 200:
-                    return response.json()
-                if response.status_code in [403, 413]:
-                    return {}
-            except requests.exceptions.Timeout:
-                pass
-            time.sleep(sleep)
+        try:
+            # Retries with backoff are handled by the session adapter.
+            response = self.session.post(url, params={'key': ytcfg['INNERTUBE_API_KEY']}, json=data, timeout=timeout)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code == 200:
+            return json_loads(response.content)
+        if response.status_code in [403, 413]:
+            return {}
+        return None
 
     def get_comments(self, youtube_id, *args, **kwargs):
         return self.get_comments_from_url(YOUTUBE_VIDEO_URL.format(youtube_id=youtube_id), *args, **kwargs)
@@ -57,29 +194,37 @@ class YoutubeCommentDownloader:
             response = self.session.post(YOUTUBE_CONSENT_URL, params=params)
 
         html = response.text
-        ytcfg = json.loads(self.regex_search(html, YT_CFG_RE, default=''))
-        if not ytcfg:
-            return  # Unable to extract configuration
+        # The INNERTUBE configuration is per-client, not per-video, so extract
+        # it once per session and skip the regex scan + JSON parse afterwards.
+        ytcfg = self._cached_ytcfg
+        if ytcfg is None:
+            ytcfg = json_loads(self.regex_search(html, YT_CFG_RE, default=''))
+            if not ytcfg:
+                return  # Unable to extract configuration
+            # Some pages (errors, consent variants) carry a smaller ytcfg.set
+            # call; only cache a config ajax_request can actually use.
+            if 'INNERTUBE_API_KEY' in ytcfg and 'INNERTUBE_CONTEXT' in ytcfg:
+                self._cached_ytcfg = ytcfg
         if language:
             ytcfg['INNERTUBE_CONTEXT']['client']['hl'] = language
 
-        data = json.loads(self.regex_search(html, YT_INITIAL_DATA_RE, default=''))
+        data = json_loads(self.regex_search(html, YT_INITIAL_DATA_RE, default=''))
         video_title = self.extract_video_title(data, html)
 
-        item_section = next(self.search_dict(data, 'itemSectionRenderer'), None)
-        renderer = next(self.search_dict(item_section, 'continuationItemRenderer'), None) if item_section else None
+        item_section = search_dict_first(data, 'itemSectionRenderer')
+        renderer = search_dict_first(item_section, 'continuationItemRenderer') if item_section else None
         if not renderer:
             # Comments disabled?
             return
 
-        sort_menu = next(self.search_dict(data, 'sortFilterSubMenuRenderer'), {}).get('subMenuItems', [])
+        sort_menu = search_dict_first(data, 'sortFilterSubMenuRenderer', {}).get('subMenuItems', [])
         if not sort_menu:
             # No sort menu. Maybe this is a request for community posts?
-            section_list = next(self.search_dict(data, 'sectionListRenderer'), {})
+            section_list = search_dict_first(data, 'sectionListRenderer', {})
             continuations = list(self.search_dict(section_list, 'continuationEndpoint'))
             # Retry..
             data = self.ajax_request(continuations[0], ytcfg) if continuations else {}
-            sort_menu = next(self.search_dict(data, 'sortFilterSubMenuRenderer'), {}).get('subMenuItems', [])
+            sort_menu = search_dict_first(data, 'sortFilterSubMenuRenderer', {}).get('subMenuItems', [])
         if not sort_menu or sort_by >= len(sort_menu):
             raise RuntimeError('Failed to set sorting')
         continuations = [sort_menu[sort_by]['serviceEndpoint']]
@@ -91,36 +236,36 @@ class YoutubeCommentDownloader:
             if not response:
                 break
 
-            error = next(self.search_dict(response, 'externalErrorMessage'), None)
+            hits = search_dict_multi(response, COMMENT_RESPONSE_KEYS)
+
+            error = hits['externalErrorMessage']
             if error:
-                raise RuntimeError('Error returned from server: ' + error)
+                raise RuntimeError('Error returned from server: ' + error[0])
 
-            actions = list(self.search_dict(response, 'reloadContinuationItemsCommand')) + \
-                      list(self.search_dict(response, 'appendContinuationItemsAction'))
+            actions = hits['reloadContinuationItemsCommand'] + hits['appendContinuationItemsAction']
             for action in actions:
                 for item in action.get('continuationItems', []):
-                    if action['targetId'] in ['comments-section',
-                                              'engagement-panel-comments-section',
-                                              'shorts-engagement-panel-comments-section']:
+                    if action['targetId'] in COMMENT_SECTION_TARGETS:
                         # Process continuations for comments and replies.
                         continuations[:0] = [ep for ep in self.search_dict(item, 'continuationEndpoint')]
-                    if action['targetId'].startswith('comment-replies-item') and 'continuationItemRenderer' in item:
+                    if action['targetId'].startswith(COMMENT_REPLIES_PREFIX) and 'continuationItemRenderer' in item:
                         # Process the 'Show more replies' button
-                        continuations.append(next(self.search_dict(item, 'buttonRenderer'))['command'])
+                        continuations.append(search_dict_first(item, 'buttonRenderer')['command'])
 
-            surface_payloads = self.search_dict(response, 'commentSurfaceEntityPayload')
-            payments = {payload['key']: next(self.search_dict(payload, 'simpleText'), '')
-                        for payload in surface_payloads if 'pdgCommentChip' in payload}
+            payments = {payload['key']: search_dict_first(payload, 'simpleText', '')
+                        for payload in hits['commentSurfaceEntityPayload'] if 'pdgCommentChip' in payload}
             if payments:
                 # We need to map the payload keys to the comment IDs.
-                view_models = [vm['commentViewModel'] for vm in self.search_dict(response, 'commentViewModel')]
+                view_models = [vm['commentViewModel'] for vm in hits['commentViewModel']
+                               if 'commentViewModel' in vm]
                 surface_keys = {vm['commentSurfaceKey']: vm['commentId']
                                 for vm in view_models if 'commentSurfaceKey' in vm}
                 payments = {surface_keys[key]: payment for key, payment in payments.items() if key in surface_keys}
 
-            toolbar_payloads = self.search_dict(response, 'engagementToolbarStateEntityPayload')
-            toolbar_states = {payload['key']: payload for payload in toolbar_payloads}
-            for comment in reversed(list(self.search_dict(response, 'commentEntityPayload'))):
+            toolbar_states = {payload['key']: payload for payload in hits['engagementToolbarStateEntityPayload']}
+            comment_payloads = hits['commentEntityPayload']
+            comment_payloads.reverse()
+            for comment in comment_payloads:
                 properties = comment['properties']
                 cid = properties['commentId']
                 author = comment['author']
@@ -142,10 +287,15 @@ class YoutubeCommentDownloader:
                 if video_title:
                     result['video_title'] = video_title
 
-                try:
-                    result['time_parsed'] = dateparser.parse(result['time'].split('(')[0].strip()).timestamp()
-                except AttributeError:
-                    pass
+                time_text = result['time'].split('(')[0].strip()
+                time_parsed = parse_relative_time(time_text)
+                if time_parsed is None:
+                    try:
+                        time_parsed = dateparser.parse(time_text).timestamp()
+                    except AttributeError:
+                        pass
+                if time_parsed is not None:
+                    result['time_parsed'] = time_parsed
 
                 if cid in payments:
                     result['paid'] = payments[cid]
@@ -158,19 +308,7 @@ class YoutubeCommentDownloader:
         match = re.search(pattern, text)
         return match.group(group) if match else default
 
-    @staticmethod
-    def search_dict(partial, search_key):
-        stack = [partial]
-        while stack:
-            current_item = stack.pop()
-            if isinstance(current_item, dict):
-                for key, value in current_item.items():
-                    if key == search_key:
-                        yield value
-                    else:
-                        stack.append(value)
-            elif isinstance(current_item, list):
-                stack.extend(current_item)
+    search_dict = staticmethod(search_dict)
 
     @staticmethod
     def extract_video_title(initial_data, html):
@@ -178,7 +316,7 @@ class YoutubeCommentDownloader:
         Extract the video title from the initial data payload or HTML meta tags.
         Falls back to <title> tag if structured data is unavailable.
         """
-        title_data = next(YoutubeCommentDownloader.search_dict(initial_data, 'videoTitle'), None)
+        title_data = search_dict_first(initial_data, 'videoTitle')
         if isinstance(title_data, dict):
             runs = title_data.get('runs')
             if runs and isinstance(runs, list):
@@ -190,20 +328,32 @@ class YoutubeCommentDownloader:
             if simple_text:
                 return simple_text
 
+        if HTMLParser is not None:
+            # One parser pass over the document instead of three regex scans.
+            tree = HTMLParser(html)
+            node = tree.css_first('yt-formatted-string.ytd-watch-metadata')
+            if node and node.attributes.get('title'):
+                return node.attributes['title']
+            node = tree.css_first('meta[name="title"]')
+            if node and node.attributes.get('content'):
+                return node.attributes['content']
+            node = tree.css_first('title')
+            if node:
+                title = node.text().replace('- YouTube', '').strip()
+                if title:
+                    return title
+            return None
+
         # Common on watch pages: title attribute on yt-formatted-string within ytd-watch-metadata
-        h1_match = re.search(
-            r'<yt-formatted-string[^>]+class="[^"]*ytd-watch-metadata[^"]*"[^>]+title="([^"]+)"',
-            html,
-            flags=re.IGNORECASE,
-        )
+        h1_match = YT_WATCH_TITLE_RE.search(html)
         if h1_match:
             return h1_match.group(1)
 
-        meta_match = re.search(r'<meta[^>]+name="title"[^>]+content="([^"]+)"', html)
+        meta_match = YT_META_TITLE_RE.search(html)
         if meta_match:
             return meta_match.group(1)
 
-        title_match = re.search(r'<title>(.*?)</title>', html, flags=re.DOTALL | re.IGNORECASE)
+        title_match = YT_TITLE_TAG_RE.search(html)
         if title_match:
             return title_match.group(1).replace('- YouTube', '').strip()
 